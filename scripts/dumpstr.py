@@ -54,17 +54,19 @@ class Dumpstr(object):
         """
 
         out = []
+        # The label column has a fixed width, so the line format only needs
+        # to be looked up once rather than rebuilt for every line.
+        formatLine = '{0:<45} {1:}'.format
         for section in data:
             out.append('=== {0:} ==='.format(section['key']))
             for line in section['lines']:
                 if type(line['summary']) is list:
                     summary = ' / '.join(line['summary'])
                 elif type(line['summary']) is float:
-                    summary = '{0:7.2f}' % line['summary']
+                    summary = '{0:7.2f}'.format(line['summary'])
                 else:
                     summary = str(line['summary'])
-                out.append('{0:<45} {1:}'.format(
-                    '{0:}:'.format(line['key']), summary))
+                out.append(formatLine(line['key'] + ':', summary))
             out.append('')
         print('\n'.join(out), file=file)
 
@@ -25,6 +25,7 @@ from glob import glob
 from optparse import OptionParser
 from pprint import pprint
 from functools import partial
+from itertools import chain
 import math
 import os
 import random
@@ -35,6 +36,15 @@ from common import *
 
 __all__ = ['parseRecovery', 'makeReport']
 
+# Byte units used when reporting sizes and bandwidths.
+MIB = 1 << 20
+GIB = 1 << 30
+
+# Pattern used while scanning the client log; compiled once here since
+# the log can be very large.
+_RECOVERY_RE = re.compile(
+    r'\bRecovery completed in (\d+) ns, failure detected in (\d+) ns\b')
+
 ### Utilities:
 
 class AttrDict(dict):
@@ -51,72 +61,133 @@ class AttrDict(dict):
     def __delattr__(self, name):
         del self[name]
 
-    def assign(self, path, value):
-        """
-        Given a hierarchical path such as 'x.y.z' and
-        a value, perform an assignment as if the statement
-        self.x.y.z had been invoked.
+class Metrics(dict):
+    """The metrics for one server, keyed by their full dotted names
+    (e.g. 'master.recoveryTicks').
+
+    Keeping the metrics flat makes storing them during parsing a single
+    dict assignment. Attribute syntax still works for reading them:
+    m.master.recoveryTicks returns m['master.recoveryTicks'], going through
+    a MetricsGroup for 'master' that is created on first use and cached.
+    """
+    __slots__ = ('_groups',)
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        object.__setattr__(self, '_groups', {})
+    def __getattr__(self, name):
+        if name in self:
+            return self[name]
+        return self.group(name)
+    def __setattr__(self, name, value):
+        self[name] = value
+    def __delattr__(self, name):
+        del self[name]
+
+    def group(self, path):
+        """Return the (cached) MetricsGroup for the dotted prefix 'path'."""
+        groups = self._groups
+        if path not in groups:
+            groups[path] = MetricsGroup(self, path + '.')
+        return groups[path]
+
+class MetricsGroup(object):
+    """A read-only view of the metrics in a Metrics object that share a
+    common dotted prefix, such as 'master.' or 'transport.receive.'."""
+    __slots__ = ('_metrics', '_prefix')
+
+    def __init__(self, metrics, prefix):
+        self._metrics = metrics
+        self._prefix = prefix
+    def __getattr__(self, name):
+        path = self._prefix + name
+        if path in self._metrics:
+            return self._metrics[path]
+        return self._metrics.group(path)
+    def __getitem__(self, name):
+        return self._metrics[self._prefix + name]
+
+class Hosts(list):
+    """A list of the Metrics for the servers acting in one role (e.g. all of
+    the recovery masters).
+
+    It also caches per-host columns derived from those metrics, so a field
+    that shows up on several lines of a report is only gathered once.
+    """
+    __slots__ = ('_columns',)
+
+    def __init__(self, *args):
+        list.__init__(self, *args)
+        self._columns = {}
+
+    def seconds(self, field):
+        """Return the points for a field of ticks on each host, converted to
+        seconds.
+
+        @type  field: string
+        @param field: the full dotted name of the field, e.g.
+                      'master.recoveryTicks'
         """
-        names = path.split('.')
-        container = self
-        for name in names[0:-1]:
-            if name not in container:
-                container[name] = AttrDict()
-            container = container[name]
-        container[names[-1]] = value
-
-def parse(f):
+        columns = self._columns
+        if field not in columns:
+            columns[field] = [(h.serverId, h[field] * h.secondsPerTick)
+                              for h in self]
+        return columns[field]
+
+def parse(f, client=None):
     """
     Scan a log file containing metrics for several servers, and return
-    a list of AttrDicts, one containing the metrics for each server.
+    a list of Metrics, one containing the metrics for each server.
+
+    If client is given, the client's "Recovery completed" line is picked
+    up during the same pass and its timings are stored in client.
     """
 
     list = []
+    # The server whose metrics are currently being read; most lines store
+    # into it, so keep it in a local rather than indexing list each time.
+    server = None
     for line in f:
-        match = re.match('.* Metrics: (.*)$', line)
-        if not match:
+        # Most lines carry no metrics; a plain substring search rejects
+        # them (and finds the metrics in the rest) much faster than a regex.
+        index = line.find(' Metrics: ')
+        if index < 0:
+            if client is not None and 'Recovery completed' in line:
+                m = _RECOVERY_RE.search(line)
+                if m:
+                    failureDetectionNs = int(m.group(2))
+                    client.recoveryNs = int(m.group(1)) - failureDetectionNs
+                    client.failureDetectionNs = failureDetectionNs
+                    # A log covers a single recovery, so stop checking the
+                    # remaining lines for this.
+                    client = None
             continue
-        info = match.group(1)
-        start = re.match('begin server (.*)', info)
-        if start:
-            list.append(AttrDict())
+        info = line[index + len(' Metrics: '):].rstrip('\n')
+        if info.startswith('begin server '):
+            locator = info[len('begin server '):]
+            server = Metrics()
+            list.append(server)
             # Compute a human-readable name for this server (ideally
             # just its short host name).
-            short_name = re.search('host=([^,]*)', start.group(1))
-            if short_name:
-               list[-1].server = short_name.group(1)
+            hostStart = locator.find('host=')
+            if hostStart >= 0:
+               hostStart += len('host=')
+               hostEnd = locator.find(',', hostStart)
+               if hostEnd < 0:
+                   hostEnd = len(locator)
+               server.server = locator[hostStart:hostEnd]
             else:
-               list[-1].server = start.group(1)
+               server.server = locator
             continue;
-        if len(list) == 0:
-            raise Exception, ('metrics data before "begin server" in %s'
-                              % f.name)
-        var, value = info.split(' ')
-        list[-1].assign(var, int(value))
+        if server is None:
+            raise Exception('metrics data before "begin server" in %s'
+                            % f.name)
+        var, _, value = info.partition(' ')
+        server[var] = int(value)
     if len(list) == 0:
-        raise Exception, 'no metrics in %s' % f.name
+        raise Exception('no metrics in %s' % f.name)
     return list
 
-def maxTuple(tuples):
-    """Return the tuple whose first element is largest."""
-    maxTuple = None;
-    maxValue = 0.0;
-    for tuple in tuples:
-        if tuple[0] > maxValue:
-            maxValue = tuple[0]
-            maxTuple = tuple
-    return maxTuple
-
-def minTuple(tuples):
-    """Return the tuple whose first element is smallest."""
-    minTuple = None;
-    minValue = 1e100;
-    for tuple in tuples:
-        if tuple[0] < minValue:
-            minValue = tuple[0]
-            minTuple = tuple
-    return minTuple
-
 def values(s):
     """Return a sequence of the second items from a sequence."""
     return [p[1] for p in s]
@@ -136,18 +207,30 @@ def scale(points, scalar):
     """
 
     if type(points) is list:
-        try:
+        if points and isinstance(points[0], (tuple, list)):
             return [(k, p * scalar) for k, p in points]
-        except TypeError:
-            return [p * scalar for p in points]
+        return [p * scalar for p in points]
     else:
         return points * scalar
 
+def allEqual(values):
+    """Return True if every item in the non-empty sequence 'values' is the
+    same.
+
+    This stops at the first differing item, which makes it much cheaper than
+    comparing max(values) with min(values).
+    """
+    first = values[0]
+    for value in values:
+        if value != first:
+            return False
+    return True
+
 def toString(x):
     """Return a reasonable string conversion for the argument."""
-    if type(x) is int:
+    if isinstance(x, int):
         return '{0:7d}'.format(x)
-    elif type(x) is float:
+    elif isinstance(x, float):
         return '{0:7.2f}'.format(x)
     else:
         return '{0:>7s}'.format(x)
@@ -164,7 +247,7 @@ def toString(x):
 
 def AVG(values, unit):
     """Returns the average of its values."""
-    if max(values) > min(values):
+    if not allEqual(values):
         r = toString(sum(values) / len(values))
         if unit:
             r += ' ' + unit
@@ -177,7 +260,7 @@ def AVG(values, unit):
 
 def MIN(values, unit):
     """Returns the minimum of the values if the range is non-zero."""
-    if len(values) < 2 or max(values) == min(values):
+    if len(values) < 2 or allEqual(values):
         return []
     r = toString(min(values))
     if unit:
@@ -187,7 +270,7 @@ def MIN(values, unit):
 
 def MAX(values, unit):
     """Returns the maximum of the values if the range is non-zero."""
-    if len(values) < 2 or max(values) == min(values):
+    if len(values) < 2 or allEqual(values):
         return []
     r = toString(max(values))
     if unit:
@@ -208,10 +291,13 @@ def SUM(values, unit):
 def FRAC(total):
     """Returns a function that shows the average percentage of the values from
     the total given."""
+    # Fold the conversion to a percentage into one factor up front so each
+    # use only needs a sum and a multiply.
+    percentOfTotal = 100 / total
     def realFrac(values, unit):
-        r = toString(sum(values) / len(values) / total * 100)
+        r = toString(sum(values) / len(values) * percentOfTotal)
         r += '%'
-        if max(values) > min(values):
+        if not allEqual(values):
             r += ' avg'
         return [r]
     return realFrac
@@ -310,18 +396,18 @@ class Section(object):
         if type(points) is str:
             summary = points
         else:
-            values = []
             if type(points) is list:
-                for point in points:
-                    try:
-                        label, point = point
-                    except TypeError:
-                        pass
-                    assert type(point) in [int, float]
-                    values.append(point)
+                # Points come in as a whole column of one shape, so decide
+                # between pairs and bare numbers once rather than per point.
+                if points and isinstance(points[0], (tuple, list)):
+                    values = [point for label, point in points]
+                else:
+                    values = list(points)
+                for point in values:
+                    assert isinstance(point, (int, float))
             else:
-                assert type(points) in [int, float]
-                values.append(points)
+                assert isinstance(points, (int, float))
+                values = [points]
 
             summary = []
             for fn in summaryFns:
@@ -352,12 +438,18 @@ class Section(object):
 def parseRecovery(recovery_dir):
     data = AttrDict()
     data.log_dir = os.path.realpath(os.path.expanduser(recovery_dir))
-    logFile = glob('%s/client*.*.log' % recovery_dir)[0]
+    logFile = glob(os.path.join(recovery_dir, 'client*.*.log'))[0]
 
-    data.backups = []
-    data.masters = []
-    data.servers = parse(open(logFile))
+    data.backups = Hosts()
+    data.masters = Hosts()
+    data.client = AttrDict()
+    # Recovery logs can be hundreds of MB; read them in large chunks.
+    with open(logFile, 'r', 1 << 18) as f:
+        data.servers = parse(f, data.client)
     for server in data.servers:
+        # Tick counts are converted to seconds all over the report; keep
+        # the reciprocal around so that is a multiply rather than a divide.
+        server.secondsPerTick = 1 / server.clockFrequency
         # Each iteration of this loop corresponds to one server's
         # log file. Figure out whether this server is a coordinator,
         # master, backup, or both master and backup, and put the
@@ -371,17 +463,7 @@ def parseRecovery(recovery_dir):
 
     # Calculator the total number of unique server nodes (subtract 1 for the
     # coordinator).
-    data.totalNodes = len(set([server.server for server in data.servers])) - 1
-        
-    data.client = AttrDict()
-    for line in open(glob('%s/client*.*.log' % recovery_dir)[0]):
-        m = re.search(
-            r'\bRecovery completed in (\d+) ns, failure detected in (\d+) ns\b',
-            line)
-        if m:
-            failureDetectionNs = int(m.group(2))
-            data.client.recoveryNs = int(m.group(1)) - failureDetectionNs
-            data.client.failureDetectionNs = failureDetectionNs
+    data.totalNodes = len({server.server for server in data.servers}) - 1
     return data
 
 def rawSample(data):
@@ -412,6 +494,7 @@ def makeReport(data):
     servers = data.servers
 
     recoveryTime = data.client.recoveryNs / 1e9
+    invRecoveryTime = 1 / recoveryTime
     failureDetectionTime = data.client.failureDetectionNs / 1e9
     report = Report()
 
@@ -438,6 +521,31 @@ def makeReport(data):
         fun2 = make_fail_fun(fun, fail)
         return [(backup.serverId, fun2(backup)) for backup in backups]
 
+    def remainder(hosts, total, *parts):
+        """Return the points for the ticks in field 'total' less the ticks in
+        each of the fields in 'parts', converted to seconds, for each host.
+
+        The subtraction is done on the integer tick counts before converting,
+        so parts that exactly make up the total leave a clean 0.
+        """
+        return [(h.serverId,
+                 (h[total] - sum(h[part] for part in parts)) * h.secondsPerTick)
+                for h in hosts]
+
+    def average_master_seconds(fields):
+        """Return the average over all masters of each of several fields of
+        ticks, converted to seconds, using a single pass over the masters.
+
+        @type  fields: list of strings
+        @param fields: the full dotted names of the fields
+        """
+        totals = [0] * len(fields)
+        for m in masters:
+            secondsPerTick = m.secondsPerTick
+            for i, field in enumerate(fields):
+                totals[i] += m[field] * secondsPerTick
+        return [total / len(masters) for total in totals]
+
 
     summary = report.add(Section('Summary'))
     summary.line('Recovery time', recoveryTime, 's')
@@ -457,21 +565,21 @@ def makeReport(data):
                  'bytes')
 
     summary.line('Total recovery segment entries',
-                 sum([master.master.recoverySegmentEntryCount
-                      for master in masters]))
+                 sum(master.master.recoverySegmentEntryCount
+                     for master in masters))
 
     summary.line('Total live object space',
-                 sum([master.master.liveObjectBytes
-                      for master in masters]) / 1024.0 / 1024.0,
+                 sum(master.master.liveObjectBytes
+                     for master in masters) / MIB,
                  'MB')
 
     summary.line('Total recovery segment space w/ overhead',
-                 sum([master.master.segmentReadByteCount
-                      for master in masters]) / 1024.0 / 1024.0,
+                 sum(master.master.segmentReadByteCount
+                     for master in masters) / MIB,
                  'MB')
 
     if backups:
-        storageTypes = set([backup.backup.storageType for backup in backups])
+        storageTypes = {backup.backup.storageType for backup in backups}
         if len(storageTypes) > 1:
             storageTypeStr = 'mixed'
         else:
@@ -486,41 +594,40 @@ def makeReport(data):
     summary.line('Log directory', data.log_dir)
 
     coordSection = report.add(Section('Coordinator Time'))
-    coordSection.ms('Total',
-                    coord.coordinator.recoveryTicks /
-                    coord.clockFrequency,
-                    total=recoveryTime)
-
-    coordSection.ms('Starting recovery on backups',
-        coord.coordinator.recoveryBuildReplicaMapTicks / coord.clockFrequency,
-        total=recoveryTime)
-    coordSection.ms('Starting recovery on masters',
-        coord.coordinator.recoveryStartTicks / coord.clockFrequency,
-        total=recoveryTime)
-    coordSection.ms('Tablets recovered',
-        coord.rpc.recovery_master_finishedTicks / coord.clockFrequency,
-        total=recoveryTime)
-    coordSection.ms('Completing recovery on backups',
-        coord.coordinator.recoveryCompleteTicks / coord.clockFrequency,
-        total=recoveryTime)
-    coordSection.ms('Get table config',
-        coord.rpc.get_table_configTicks / coord.clockFrequency,
-        total=recoveryTime)
-    coordSection.ms('Other',
+    # Every coordinator line is a fraction of the total recovery time.
+    coordMs = partial(coordSection.ms, total=recoveryTime)
+    coordMs('Total',
+        coord.coordinator.recoveryTicks * coord.secondsPerTick)
+
+    coordMs('Starting recovery on backups',
+        coord.coordinator.recoveryBuildReplicaMapTicks * coord.secondsPerTick)
+    coordMs('Starting recovery on masters',
+        coord.coordinator.recoveryStartTicks * coord.secondsPerTick)
+    coordMs('Tablets recovered',
+        coord.rpc.recovery_master_finishedTicks * coord.secondsPerTick)
+    coordMs('Completing recovery on backups',
+        coord.coordinator.recoveryCompleteTicks * coord.secondsPerTick)
+    coordMs('Get table config',
+        coord.rpc.get_table_configTicks * coord.secondsPerTick)
+    coordMs('Other',
         ((coord.coordinator.recoveryTicks -
           coord.coordinator.recoveryBuildReplicaMapTicks -
           coord.coordinator.recoveryStartTicks -
           coord.rpc.get_table_configTicks -
-          coord.rpc.recovery_master_finishedTicks) /
-         coord.clockFrequency),
-        total=recoveryTime)
-    coordSection.ms('Receiving in transport',
-        coord.transport.receive.ticks / coord.clockFrequency,
-        total=recoveryTime)
+          coord.rpc.recovery_master_finishedTicks) *
+         coord.secondsPerTick))
+    coordMs('Receiving in transport',
+        coord.transport.receive.ticks * coord.secondsPerTick)
+
+    (recoveryMasterTime, recoverSegmentTime, replicaManagerTime,
+     replicationTime, logSyncTime) = average_master_seconds(
+        ['master.recoveryTicks', 'master.recoverSegmentTicks',
+         'master.backupInRecoverTicks', 'master.replicationTicks',
+         'master.logSyncTicks'])
+    replayTime = replicationTime - logSyncTime
 
     masterSection = report.add(Section('Recovery Master Time'))
 
-    recoveryMasterTime = sum([m.master.recoveryTicks / m.clockFrequency for m in masters]) / len(masters)
     def master_ticks(label, field):
         """This is a shortcut for adding to the masterSection a recorded number
         of ticks that are a fraction of the total recovery.
@@ -531,103 +638,83 @@ def makeReport(data):
         @type  field: string
         @param field: the field within a master's metrics that collected ticks
         """
-        masterSection.ms(label,
-                         on_masters(lambda m: eval('m.' + field) /
-                                              m.clockFrequency),
+        masterSection.ms(label, masters.seconds(field),
                          total=recoveryMasterTime)
 
     masterSection.ms('Total (versus end-to-end recovery time)',
-                     on_masters(lambda m: m.master.recoveryTicks /
-                                          m.clockFrequency),
+                     masters.seconds('master.recoveryTicks'),
                      total=recoveryTime)
+    # The parts of a master's recovery time; 'Other' is whatever is left.
+    masterParts = [
+        ('Waiting for incoming segments', 'master.segmentReadStallTicks'),
+        ('Inside recoverSegment', 'master.recoverSegmentTicks'),
+        ('Final log sync time', 'master.logSyncTicks'),
+        ('Removing tombstones', 'master.removeTombstoneTicks'),
+    ]
     master_ticks('Total',
                  'master.recoveryTicks')
-    master_ticks('Waiting for incoming segments',
-                 'master.segmentReadStallTicks')
-    master_ticks('Inside recoverSegment',
-                 'master.recoverSegmentTicks')
-    master_ticks('Final log sync time',
-                 'master.logSyncTicks')
-    master_ticks('Removing tombstones',
-                 'master.removeTombstoneTicks')
+    for label, field in masterParts:
+        master_ticks(label, field)
     masterSection.ms('Other',
-                     on_masters(lambda m: (m.master.recoveryTicks -
-                                           m.master.segmentReadStallTicks -
-                                           m.master.recoverSegmentTicks -
-                                           m.master.logSyncTicks -
-                                           m.master.removeTombstoneTicks) /
-                                          m.clockFrequency),
+                     remainder(masters, 'master.recoveryTicks',
+                               *[field for label, field in masterParts]),
                      total=recoveryTime)
 
-    recoverSegmentTime = sum([m.master.recoverSegmentTicks / m.clockFrequency  for m in masters]) / len(masters)
     recoverSegmentSection = report.add(Section('Recovery Master recoverSegment Time'))
     def recoverSegment_ticks(label, field):
-        recoverSegmentSection.ms(label,
-                         on_masters(lambda m: eval('m.' + field) /
-                                              m.clockFrequency),
+        recoverSegmentSection.ms(label, masters.seconds(field),
                          total=recoverSegmentTime)
     recoverSegmentSection.ms('Total (versus end-to-end recovery time)',
-                     on_masters(lambda m: m.master.recoverSegmentTicks /
-                                          m.clockFrequency),
+                     masters.seconds('master.recoverSegmentTicks'),
                      total=recoveryTime)
+    # The parts of the time in recoverSegment; 'Other' is whatever is left.
+    recoverSegmentParts = [
+        ('Managing replication', 'master.backupInRecoverTicks'),
+        ('Verify checksum', 'master.verifyChecksumTicks'),
+        ('Segment append', 'master.segmentAppendTicks'),
+        # No longer measured: could be useful in the future.
+        # ('Segment append copy', 'master.segmentAppendCopyTicks'),
+    ]
     recoverSegment_ticks('Total',
                  'master.recoverSegmentTicks')
-    recoverSegment_ticks('Managing replication',
-                 'master.backupInRecoverTicks')
-    recoverSegment_ticks('Verify checksum',
-                 'master.verifyChecksumTicks')
-    recoverSegment_ticks('Segment append',
-                 'master.segmentAppendTicks')
-    # No longer measured: could be useful in the future. Make sure to add it to Other if used again.
-    # recoverSegment_ticks('Segment append copy',
-    #              'master.segmentAppendCopyTicks')
+    for label, field in recoverSegmentParts:
+        recoverSegment_ticks(label, field)
     recoverSegmentSection.ms('Other',
-                     on_masters(lambda m: (m.master.recoverSegmentTicks -
-                                           m.master.backupInRecoverTicks -
-                                           m.master.verifyChecksumTicks -
-                                           m.master.segmentAppendTicks) /
-                                          m.clockFrequency),
+                     remainder(masters, 'master.recoverSegmentTicks',
+                               *[field for label, field in recoverSegmentParts]),
                      total=recoverSegmentTime)
 
-    replicaManagerTime = sum([m.master.backupInRecoverTicks / m.clockFrequency  for m in masters]) / len(masters)
     replicaManagerSection = report.add(Section('Recovery Master ReplicaManager Time during recoverSegment'))
     def replicaManager_ticks(label, field):
-        replicaManagerSection.ms(label,
-                         on_masters(lambda m: eval('m.' + field) /
-                                              m.clockFrequency),
+        replicaManagerSection.ms(label, masters.seconds(field),
                          total=replicaManagerTime)
     replicaManagerSection.ms('Total (versus end-to-end recovery time)',
-                     on_masters(lambda m: m.master.backupInRecoverTicks /
-                                          m.clockFrequency),
+                     masters.seconds('master.backupInRecoverTicks'),
                      total=recoveryTime)
     replicaManager_ticks('Total',
                  'master.backupInRecoverTicks')
     replicaManagerSection.ms('Posting write RPCs for TX to transport',
-                     on_masters(lambda m: (m.master.recoverSegmentPostingWriteRpcTicks) /
-                                          m.clockFrequency),
+                     masters.seconds('master.recoverSegmentPostingWriteRpcTicks'),
                      total=replicaManagerTime)
     replicaManagerSection.ms('Other',
-                     on_masters(lambda m: (m.master.backupInRecoverTicks -
-                                           m.master.recoverSegmentPostingWriteRpcTicks) /
-                                          m.clockFrequency),
+                     remainder(masters, 'master.backupInRecoverTicks',
+                               'master.recoverSegmentPostingWriteRpcTicks'),
                      total=replicaManagerTime)
 
     masterStatsSection = report.add(Section('Recovery Master Stats'))
     def masterStats_ticks(label, field):
-        masterStatsSection.ms(label,
-                         on_masters(lambda m: eval('m.' + field) /
-                                              m.clockFrequency),
+        masterStatsSection.ms(label, masters.seconds(field),
                          total=recoveryTime)
     masterStatsSection.line('Final log sync amount',
-        on_masters(lambda m: (m.master.logSyncBytes / 2**20)),
+        on_masters(lambda m: (m.master.logSyncBytes / MIB)),
         unit='MB',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('Total replication amount',
-        on_masters(lambda m: (m.master.replicationBytes / 2**20)),
+        on_masters(lambda m: (m.master.replicationBytes / MIB)),
         unit='MB',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('Total replication during replay',
-        on_masters(lambda m: ((m.master.replicationBytes - m.master.logSyncBytes) / 2**20)),
+        on_masters(lambda m: ((m.master.replicationBytes - m.master.logSyncBytes) / MIB)),
         unit='MB',
         summaryFns=[AVG, MIN, SUM])
 
@@ -642,8 +729,8 @@ def makeReport(data):
                  'transport.clientRpcsActiveTicks')
     masterStatsSection.ms('Average GRD completion time',
         on_masters(lambda m: (m.master.segmentReadTicks /
-                              m.master.segmentReadCount /
-                              m.clockFrequency)))
+                              m.master.segmentReadCount *
+                              m.secondsPerTick)))
 
     # There used to be a bunch of code here for analyzing the variance in
     # session open times. We don't open sessions during recovery anymore, so
@@ -651,19 +738,19 @@ def makeReport(data):
     # back. -Diego
 
     masterStatsSection.line('Log replication rate',
-        on_masters(lambda m: (m.master.replicationBytes / m.master.replicas / 2**20 /
-                              (m.master.replicationTicks / m.clockFrequency))),
+        on_masters(lambda m: (m.master.replicationBytes / m.master.replicas / MIB /
+                              (m.master.replicationTicks * m.secondsPerTick))),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('Log replication rate during replay',
         on_masters(lambda m: ((m.master.replicationBytes - m.master.logSyncBytes)
-                               / m.master.replicas / 2**20 /
-                              ((m.master.replicationTicks - m.master.logSyncTicks)/ m.clockFrequency))),
+                               / m.master.replicas / MIB /
+                              ((m.master.replicationTicks - m.master.logSyncTicks) * m.secondsPerTick))),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('Log replication rate during log sync',
-        on_masters(lambda m: (m.master.logSyncBytes / m.master.replicas / 2**20 /
-                              (m.master.logSyncTicks / m.clockFrequency))),
+        on_masters(lambda m: (m.master.logSyncBytes / m.master.replicas / MIB /
+                              (m.master.logSyncTicks * m.secondsPerTick))),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
 
@@ -671,40 +758,36 @@ def makeReport(data):
                  'master.replicationTicks')
 
     masterStatsSection.ms('TX active',
-        on_masters(lambda m: (m.transport.infiniband.transmitActiveTicks /
-                              m.clockFrequency)),
+        on_masters(lambda m: (m.transport.infiniband.transmitActiveTicks *
+                              m.secondsPerTick)),
         total=recoveryTime)
 
-    replicationTime = sum([m.master.replicationTicks / m.clockFrequency for m in masters]) / float(len(masters))
-    logSyncTime = sum([m.master.logSyncTicks / m.clockFrequency for m in masters]) / float(len(masters))
-    replayTime = sum([(m.master.replicationTicks - m.master.logSyncTicks)/ m.clockFrequency for m in masters]) / float(len(masters))
-
     masterStatsSection.ms('TX active during replication',
-        on_masters(lambda m: (m.master.replicationTransmitActiveTicks /
-                              m.clockFrequency)),
+        on_masters(lambda m: (m.master.replicationTransmitActiveTicks *
+                              m.secondsPerTick)),
         total=replicationTime)
     masterStatsSection.ms('TX active during replay',
-        on_masters(lambda m: ((m.master.replicationTransmitActiveTicks - m.master.logSyncTransmitActiveTicks) /
-                              m.clockFrequency)),
+        on_masters(lambda m: ((m.master.replicationTransmitActiveTicks - m.master.logSyncTransmitActiveTicks) *
+                              m.secondsPerTick)),
         total=replayTime)
     masterStatsSection.ms('TX active during log sync',
-        on_masters(lambda m: (m.master.logSyncTransmitActiveTicks /
-                              m.clockFrequency)),
+        on_masters(lambda m: (m.master.logSyncTransmitActiveTicks *
+                              m.secondsPerTick)),
         total=logSyncTime)
 
     masterStatsSection.line('TX active rate during replication',
-        on_masters(lambda m: m.master.replicationBytes / 2**20 / (m.master.replicationTransmitActiveTicks /
-                              m.clockFrequency)),
+        on_masters(lambda m: m.master.replicationBytes / MIB / (m.master.replicationTransmitActiveTicks *
+                              m.secondsPerTick)),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('TX active rate during replay',
-        on_masters(lambda m: (m.master.replicationBytes - m.master.logSyncBytes) / 2**20 / ((m.master.replicationTransmitActiveTicks - m.master.logSyncTransmitActiveTicks) /
-                              m.clockFrequency)),
+        on_masters(lambda m: (m.master.replicationBytes - m.master.logSyncBytes) / MIB / ((m.master.replicationTransmitActiveTicks - m.master.logSyncTransmitActiveTicks) *
+                              m.secondsPerTick)),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('TX active rate during log sync',
-        on_masters(lambda m: m.master.logSyncBytes / 2**20 / (m.master.logSyncTransmitActiveTicks /
-                              m.clockFrequency)),
+        on_masters(lambda m: m.master.logSyncBytes / MIB / (m.master.logSyncTransmitActiveTicks *
+                              m.secondsPerTick)),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
 
@@ -712,23 +795,23 @@ def makeReport(data):
                  'master.replicationTransmitCopyTicks')
     masterStatsSection.ms('Copying for TX during replay',
         on_masters(lambda m: (m.master.replicationTransmitCopyTicks -
-                              m.master.logSyncTransmitCopyTicks) / m.clockFrequency),
+                              m.master.logSyncTransmitCopyTicks) * m.secondsPerTick),
         total=recoveryTime)
     masterStats_ticks('Copying for TX during log sync',
                  'master.logSyncTransmitCopyTicks')
     masterStatsSection.line('Copying for tx during replication rate',
-        on_masters(lambda m: (m.master.replicationBytes / m.master.replicas / 2**20 /
-                              (m.master.replicationTransmitCopyTicks / m.clockFrequency))),
+        on_masters(lambda m: (m.master.replicationBytes / m.master.replicas / MIB /
+                              (m.master.replicationTransmitCopyTicks * m.secondsPerTick))),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('Copying for TX during replay rate',
-        on_masters(lambda m: ((m.master.replicationBytes - m.master.logSyncBytes) / m.master.replicas / 2**20 /
-                              ((m.master.replicationTransmitCopyTicks - m.master.logSyncTransmitCopyTicks) / m.clockFrequency))),
+        on_masters(lambda m: ((m.master.replicationBytes - m.master.logSyncBytes) / m.master.replicas / MIB /
+                              ((m.master.replicationTransmitCopyTicks - m.master.logSyncTransmitCopyTicks) * m.secondsPerTick))),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('Copying for TX during log sync rate',
-        on_masters(lambda m: (m.master.logSyncBytes / m.master.replicas / 2**20 /
-                              (m.master.logSyncTransmitCopyTicks / m.clockFrequency))),
+        on_masters(lambda m: (m.master.logSyncBytes / m.master.replicas / MIB /
+                              (m.master.logSyncTransmitCopyTicks * m.secondsPerTick))),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
 
@@ -738,17 +821,18 @@ def makeReport(data):
         summaryFns=[AVG, MIN, SUM])
 
     masterStatsSection.line('Memory read bandwidth used during replay',
-        on_masters(lambda m: (m.master.replayMemoryReadBytes / 2**20 /
-                              ((m.master.recoveryTicks - m.master.logSyncTicks) / m.clockFrequency))),
+        on_masters(lambda m: (m.master.replayMemoryReadBytes / MIB /
+                              ((m.master.recoveryTicks - m.master.logSyncTicks) * m.secondsPerTick))),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
     masterStatsSection.line('Memory write bandwidth used during replay',
-        on_masters(lambda m: (m.master.replayMemoryWrittenBytes / 2**20 /
-                              ((m.master.recoveryTicks - m.master.logSyncTicks) / m.clockFrequency))),
+        on_masters(lambda m: (m.master.replayMemoryWrittenBytes / MIB /
+                              ((m.master.recoveryTicks - m.master.logSyncTicks) * m.secondsPerTick))),
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
 
     backupSection = report.add(Section('Backup Time'))
+    backupMs = partial(backupSection.ms, total=recoveryTime)
 
     def backup_ticks(label, field):
         """This is a shortcut for adding to the backupSection a recorded number
@@ -760,10 +844,7 @@ def makeReport(data):
         @type  field: string
         @param field: the field within a backup's metrics that collected ticks
         """
-        backupSection.ms(label,
-                         on_backups(lambda b: eval('b.' + field) /
-                                              b.clockFrequency),
-                         total=recoveryTime)
+        backupMs(label, backups.seconds(field))
 
     backup_ticks('RPC service time',
                  'backup.serviceTicks')
@@ -773,20 +854,16 @@ def makeReport(data):
                  'rpc.backup_writeTicks')
     backup_ticks('Write copy',
                  'backup.writeCopyTicks')
-    backupSection.ms('Other write RPC',
-        on_backups(lambda b: (b.rpc.backup_writeTicks -
-                              b.backup.writeCopyTicks) /
-                             b.clockFrequency),
-        total=recoveryTime)
+    backupMs('Other write RPC',
+        remainder(backups, 'rpc.backup_writeTicks',
+                  'backup.writeCopyTicks'))
     backup_ticks('getRecoveryData RPC',
                  'rpc.backup_getrecoverydataTicks')
-    backupSection.ms('Other',
-        on_backups(lambda b: (b.backup.serviceTicks -
-                              b.rpc.backup_startreadingdataTicks -
-                              b.rpc.backup_writeTicks -
-                              b.rpc.backup_getrecoverydataTicks) /
-                             b.clockFrequency),
-        total=recoveryTime)
+    backupMs('Other',
+        remainder(backups, 'backup.serviceTicks',
+                  'rpc.backup_startreadingdataTicks',
+                  'rpc.backup_writeTicks',
+                  'rpc.backup_getrecoverydataTicks'))
     backup_ticks('Transmitting in transport',
                  'transport.transmit.ticks')
     backup_ticks('Filtering segments',
@@ -805,191 +882,225 @@ def makeReport(data):
 
     efficiencySection = report.add(Section('Efficiency'))
 
+    # The times summed here are already cached as columns for the lines
+    # above; fsum keeps the float totals accurate over many hosts.
     efficiencySection.line('recoverSegment CPU',
-         (sum([m.master.recoverSegmentTicks / m.clockFrequency
-              for m in masters]) * 1000 /
-          sum([m.master.segmentReadCount
-               for m in masters])),
+         (math.fsum(values(masters.seconds('master.recoverSegmentTicks'))) *
+          1000 /
+          sum(m.master.segmentReadCount
+              for m in masters)),
         unit='ms avg')
 
     efficiencySection.line('Writing a segment',
-        (sum([b.rpc.backup_writeTicks / b.clockFrequency
-              for b in backups]) * 1000 /
+        (math.fsum(values(backups.seconds('rpc.backup_writeTicks'))) * 1000 /
         # Divide count by 2 since each segment does two writes:
         # one to open the segment and one to write the data.
-        sum([b.rpc.backup_writeCount / 2
-             for b in backups])),
+        (sum(b.rpc.backup_writeCount
+             for b in backups) / 2)),
         unit='ms avg')
 
     #efficiencySection.line('Filtering a segment',
-    #    sum([b.backup.filterTicks / b.clockFrequency * 1000
-    #         for b in backups]) /
-    #    sum([b.backup.storageReadCount
-    #         for b in backups]),
+    #    math.fsum(values(backups.seconds('backup.filterTicks'))) * 1000 /
+    #    sum(b.backup.storageReadCount
+    #        for b in backups),
     #    unit='ms avg')
 
     efficiencySection.line('Memory bandwidth (backup copies)',
         on_backups(lambda b: (
-            (b.backup.writeCopyBytes / 2**30) /
-            (b.backup.writeCopyTicks / b.clockFrequency))),
+            (b.backup.writeCopyBytes / GIB) /
+            (b.backup.writeCopyTicks * b.secondsPerTick))),
         unit='GB/s',
         summaryFns=[AVG, MIN])
 
+    # Bytes transmitted by each master and backup; these feed both the
+    # aggregate and the per-role outbound lines.
+    masterTxBytes = [(m.serverId, m.transport.transmit.byteCount)
+                     for m in masters]
+    backupTxBytes = [(b.serverId, b.transport.transmit.byteCount)
+                     for b in backups]
+
     networkSection = report.add(Section('Network Utilization'))
     networkSection.line('Aggregate',
-        (sum([host.transport.transmit.byteCount
-              for host in [coord] + masters + backups]) *
-         8 / 2**30 / recoveryTime),
+        ((coord.transport.transmit.byteCount +
+          sum(txBytes for serverId, txBytes
+                      in chain(masterTxBytes, backupTxBytes))) *
+         8 / GIB * invRecoveryTime),
         unit='Gb/s',
         summaryFns=[AVG, FRAC(data.totalNodes*25)])
 
     networkSection.line('Master in',
-        on_masters(lambda m: (m.transport.receive.byteCount * 8 / 2**30) /
-                             recoveryTime),
+        on_masters(lambda m: (m.transport.receive.byteCount * 8 / GIB) *
+                             invRecoveryTime),
         unit='Gb/s',
         summaryFns=[AVG, MIN, SUM])
     networkSection.line('Master out',
-        on_masters(lambda m: (m.transport.transmit.byteCount * 8 / 2**30) /
-                             recoveryTime),
+        [(serverId, (txBytes * 8 / GIB) * invRecoveryTime)
+         for serverId, txBytes in masterTxBytes],
         unit='Gb/s',
         summaryFns=[AVG, MIN, SUM])
     networkSection.line('Master out during replication',
-        on_masters(lambda m: (m.master.replicationBytes * 8 / 2**30) /
-                             (m.master.replicationTicks / m.clockFrequency)),
+        on_masters(lambda m: (m.master.replicationBytes * 8 / GIB) /
+                             (m.master.replicationTicks * m.secondsPerTick)),
         unit='Gb/s',
         summaryFns=[AVG, MIN, SUM])
     networkSection.line('Master out during log sync',
-        on_masters(lambda m: (m.master.logSyncBytes * 8 / 2**30) /
-                             (m.master.logSyncTicks / m.clockFrequency)),
+        on_masters(lambda m: (m.master.logSyncBytes * 8 / GIB) /
+                             (m.master.logSyncTicks * m.secondsPerTick)),
         unit='Gb/s',
         summaryFns=[AVG, MIN, SUM])
 
     networkSection.line('Backup in',
-        on_backups(lambda b: (b.transport.receive.byteCount * 8 / 2**30) /
-                             recoveryTime),
+        on_backups(lambda b: (b.transport.receive.byteCount * 8 / GIB) *
+                             invRecoveryTime),
         unit='Gb/s',
         summaryFns=[AVG, MIN, SUM])
     networkSection.line('Backup out',
-        on_backups(lambda b: (b.transport.transmit.byteCount * 8 / 2**30) /
-                             recoveryTime),
+        [(serverId, (txBytes * 8 / GIB) * invRecoveryTime)
+         for serverId, txBytes in backupTxBytes],
         unit='Gb/s',
         summaryFns=[AVG, MIN, SUM])
 
 
+    # Per-backup disk times and bandwidths. Each of these feeds more than
+    # one line below, so they are derived together in a single pass over
+    # the backups. Backups that never touched the disk report a bandwidth
+    # of 0.
+    diskReadSeconds = backups.seconds('backup.storageReadTicks')
+    diskWriteSeconds = backups.seconds('backup.storageWriteTicks')
+    diskReadMBps = []
+    diskWriteMBps = []
+    diskActiveMBps = []
+    diskEffectiveMBps = []
+    diskActivePct = []
+    diskReadPct = []
+    diskWritePct = []
+    for b, (serverId, read), (_, write) in zip(backups, diskReadSeconds,
+                                               diskWriteSeconds):
+        readBytes = b.backup.storageReadBytes
+        writeBytes = b.backup.storageWriteBytes
+        diskReadMBps.append(
+            (serverId, readBytes / MIB / read if read else 0))
+        diskWriteMBps.append(
+            (serverId, writeBytes / MIB / write if write else 0))
+        diskActiveMBps.append(
+            (serverId, (readBytes + writeBytes) / MIB / (read + write)
+                       if read + write else 0))
+        diskEffectiveMBps.append(
+            (serverId, (readBytes + writeBytes) / MIB * invRecoveryTime))
+        diskActivePct.append(
+            (serverId, 100 * (read + write) * invRecoveryTime))
+        diskReadPct.append((serverId, 100 * read * invRecoveryTime))
+        diskWritePct.append((serverId, 100 * write * invRecoveryTime))
+
     diskSection = report.add(Section('Disk Utilization'))
     diskSection.line('Effective bandwidth',
-        on_backups(lambda b: (b.backup.storageReadBytes +
-                              b.backup.storageWriteBytes) /
-                             2**20 / recoveryTime),
+        diskEffectiveMBps,
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
 
-    def active_bandwidth(b):
-        totalBytes = b.backup.storageReadBytes + b.backup.storageWriteBytes
-        totalTicks = b.backup.storageReadTicks + b.backup.storageWriteTicks
-        return ((totalBytes / 2**20) /
-                (totalTicks / b.clockFrequency))
     diskSection.line('Active bandwidth',
-        on_backups(active_bandwidth),
+        diskActiveMBps,
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
 
     diskSection.line('Active bandwidth reading',
-        on_backups(lambda b: (b.backup.storageReadBytes / 2**20) /
-                             (b.backup.storageReadTicks / b.clockFrequency)),
+        diskReadMBps,
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
 
     diskSection.line('Active bandwidth writing',
-        on_backups(lambda b: (b.backup.storageWriteBytes / 2**20) /
-                             (b.backup.storageWriteTicks / b.clockFrequency)),
+        diskWriteMBps,
         unit='MB/s',
         summaryFns=[AVG, MIN, SUM])
 
-    diskSection.line('Disk active time',
-        on_backups(lambda b: 100 * (b.backup.storageReadTicks +
-                                    b.backup.storageWriteTicks) /
-                             b.clockFrequency /
-                             recoveryTime),
-        unit='%')
-    diskSection.line('Disk reading time',
-        on_backups(lambda b: 100 * b.backup.storageReadTicks /
-                             b.clockFrequency /
-                             recoveryTime),
-        unit='%')
-    diskSection.line('Disk writing time',
-        on_backups(lambda b: 100 * b.backup.storageWriteTicks /
-                             b.clockFrequency /
-                             recoveryTime),
-        unit='%')
+    diskSection.line('Disk active time', diskActivePct, unit='%')
+    diskSection.line('Disk reading time', diskReadPct, unit='%')
+    diskSection.line('Disk writing time', diskWritePct, unit='%')
 
     backupSection = report.add(Section('Backup Events'))
-    backupSection.line('Segments read',
-        on_backups(lambda b: b.backup.storageReadCount))
-    backupSection.line('Primary segments loaded',
-        on_backups(lambda b: b.backup.primaryLoadCount))
-    backupSection.line('Secondary segments loaded',
-        on_backups(lambda b: b.backup.secondaryLoadCount))
+    for label, field in [
+            ('Segments read', 'backup.storageReadCount'),
+            ('Primary segments loaded', 'backup.primaryLoadCount'),
+            ('Secondary segments loaded', 'backup.secondaryLoadCount')]:
+        backupSection.line(label, [(b.serverId, b[field]) for b in backups])
 
     slowSection = report.add(Section('Slowest Servers'))
 
-    slowest = maxTuple([
-            [1e03 * (master.master.replicaManagerTicks -
-             master.master.logSyncTicks) / master.clockFrequency,
-             master.server] for master in masters])
-    if slowest:
-        slowSection.line('Backup opens, writes',
-            slowest[0],
-            summaryFns=[CUSTOM(slowest[1]),
-                        CUSTOM('{0:.1f} ms'.format(slowest[0]))])
-
-    slowest = maxTuple([
-            [1e03 * master.master.segmentReadStallTicks /
-             master.clockFrequency, master.server]
-             for master in masters])
-    if slowest:
-        slowSection.line('Stalled reading segs from backups',
-            slowest[0],
-            summaryFns=[CUSTOM(slowest[1]),
-                        CUSTOM('{0:.1f} ms'.format(slowest[0]))])
-
-    slowest = minTuple([
-            [(backup.backup.storageReadBytes / 2**20) / 
-             (backup.backup.storageReadTicks / backup.clockFrequency),
-             backup.server] for backup in backups
-             if (backup.backup.storageReadTicks > 0)])
-    if slowest:
-        slowSection.line('Reading from disk',
-            slowest[0],
-            summaryFns=[CUSTOM(slowest[1]),
-                        CUSTOM('{0:.1f} MB/s'.format(slowest[0]))])
-
-    slowest = minTuple([
-            [(backup.backup.storageWriteBytes / 2**20) / 
-             (backup.backup.storageWriteTicks / backup.clockFrequency),
-             backup.server] for backup in backups
-             if backup.backup.storageWriteTicks])
-    if slowest:
-        slowSection.line('Writing to disk',
-            slowest[0],
-            summaryFns=[CUSTOM(slowest[1]),
-                        CUSTOM('{0:.1f} MB/s'.format(slowest[0]))])
+    def slow_line(key, value, server, unit):
+        """Add a line to the slowSection naming the slowest server.
+
+        @param key: see Section.line
+
+        @type  value: number
+        @param value: the slowest server's value
+
+        @type  server: string
+        @param server: the name of the slowest server
+
+        @type  unit: string
+        @param unit: a short string specifying the units for value
+        """
+        slowSection.line(key, value,
+            summaryFns=[CUSTOM(server),
+                        CUSTOM('{0:.1f} {1:}'.format(value, unit))])
+
+    # Each of the following picks out the server with the worst value by
+    # its index, rather than building a [value, server] pair per host.
+    if masters:
+        replicaManagerSeconds = [
+            (m.master.replicaManagerTicks - m.master.logSyncTicks) *
+            m.secondsPerTick for m in masters]
+        i = max(range(len(masters)), key=replicaManagerSeconds.__getitem__)
+        slowest = 1e03 * replicaManagerSeconds[i]
+        if slowest > 0:
+            slow_line('Backup opens, writes',
+                      slowest, masters[i].server, 'ms')
+
+        stallSeconds = values(masters.seconds('master.segmentReadStallTicks'))
+        i = max(range(len(masters)), key=stallSeconds.__getitem__)
+        slowest = 1e03 * stallSeconds[i]
+        if slowest > 0:
+            slow_line('Stalled reading segs from backups',
+                      slowest, masters[i].server, 'ms')
+
+    readMBps = values(diskReadMBps)
+    readers = [i for i, backup in enumerate(backups)
+               if backup.backup.storageReadTicks > 0]
+    if readers:
+        i = min(readers, key=readMBps.__getitem__)
+        slow_line('Reading from disk',
+                  readMBps[i], backups[i].server, 'MB/s')
+
+    writeMBps = values(diskWriteMBps)
+    writers = [i for i, backup in enumerate(backups)
+               if backup.backup.storageWriteTicks]
+    if writers:
+        i = min(writers, key=writeMBps.__getitem__)
+        slow_line('Writing to disk',
+                  writeMBps[i], backups[i].server, 'MB/s')
 
     tempSection = report.add(Section('Temporary Metrics'))
-    for i in range(10):
-        field = 'ticks{0:}'.format(i)
-        points = [(host.serverId, host.temp[field] / host.clockFrequency)
-                  for host in servers]
-        if any(values(points)):
-            tempSection.ms('temp.%s' % field,
-                           points,
+    # Gather all of the raw temporary metrics in one pass over the servers.
+    # Most of them are unused in any given build, so only convert ticks to
+    # seconds for the ones that actually recorded something.
+    tickFields = ['temp.ticks{0:}'.format(i) for i in range(10)]
+    countFields = ['temp.count{0:}'.format(i) for i in range(10)]
+    tickValues = [[] for field in tickFields]
+    countPoints = [[] for field in countFields]
+    for host in servers:
+        for field, ticks in zip(tickFields, tickValues):
+            ticks.append(host[field])
+        for field, points in zip(countFields, countPoints):
+            points.append((host.serverId, host[field]))
+    for field, ticks in zip(tickFields, tickValues):
+        if any(ticks):
+            tempSection.ms(field,
+                           [(host.serverId, t * host.secondsPerTick)
+                            for host, t in zip(servers, ticks)],
                            total=recoveryTime)
-    for i in range(10):
-        field = 'count{0:}'.format(i)
-        points = [(host.serverId, host.temp[field])
-                  for host in servers]
+    for field, points in zip(countFields, countPoints):
         if any(values(points)):
-            tempSection.line('temp.%s' % field,
+            tempSection.line(field,
                              points)
 
     return report